@@ -3,18 +3,43 @@ SkyWrite AI - Python Backend with Flask
 Grammar correction and writing enhancement using Google's Gemini API
 """
 
-from flask import Flask, render_template, request, jsonify
+from flask import Flask, Response, render_template, request, jsonify, stream_with_context
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
+import asyncio
 import os
+from collections import OrderedDict
+import copy
 from datetime import datetime
+from functools import lru_cache
+import hashlib
 import json
+import logging
+import re
+import threading
+import types
 from dotenv import load_dotenv
 
 # Load environment variables from .env file explicitly
 env_path = os.path.join(os.path.dirname(__file__), '.env')
 load_dotenv(dotenv_path=env_path)
-print(f"[DEBUG] Loading .env from: {env_path}")
-print(f"[DEBUG] .env exists: {os.path.exists(env_path)}")
+
+# Debug output is off unless LOG_LEVEL=DEBUG, so messages aren't even formatted by default.
+# Only this module's logger is set; the hosting server owns the root logger.
+log = logging.getLogger(__name__)
+log_level = (os.getenv('LOG_LEVEL') or 'WARNING').upper()
+if not isinstance(logging.getLevelName(log_level), int):
+    log_level, bad_log_level = 'WARNING', log_level
+else:
+    bad_log_level = None
+log.setLevel(log_level)
+if __name__ == '__main__':
+    # Development server: send records to stderr
+    logging.basicConfig()
+if bad_log_level:
+    log.warning("Unknown LOG_LEVEL %r, using WARNING", bad_log_level)
+log.debug("Loading .env from: %s", env_path)
+log.debug(".env exists: %s", os.path.exists(env_path))
 # Optional Google Generative AI SDK. If not installed, use a local fallback so the
 # web UI can run without the external dependency during development.
 try:
@@ -24,25 +49,66 @@ except Exception:
     genai = None
     HAS_GEMINI_SDK = False
 
+# Optional orjson for faster JSON parsing and serialization; the stdlib json module
+# is used when it isn't installed.
+try:
+    import orjson
+    HAS_ORJSON = True
+except Exception:
+    orjson = None
+    HAS_ORJSON = False
+
+if HAS_ORJSON:
+    def _json_dumps(obj):
+        return orjson.dumps(obj).decode('utf-8')
+    _json_loads = orjson.loads
+else:
+    _json_dumps = json.dumps
+    _json_loads = json.loads
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Flask JSON provider that serializes request and response bodies with orjson"""
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=self.default).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = args[0] if len(args) == 1 else (args or kwargs or None)
+        return self._app.response_class(
+            orjson.dumps(obj, default=self.default), mimetype=self.mimetype
+        )
+
 # Create Flask app with explicit template folder
 script_dir = os.path.dirname(os.path.abspath(__file__))
 template_dir = os.path.join(script_dir, 'templates')
-print(f"[DEBUG] Script dir: {script_dir}")
-print(f"[DEBUG] Template dir: {template_dir}")
-print(f"[DEBUG] Template dir exists: {os.path.exists(template_dir)}")
+log.debug("Script dir: %s", script_dir)
+log.debug("Template dir: %s", template_dir)
+log.debug("Template dir exists: %s", os.path.exists(template_dir))
 app = Flask(__name__, template_folder=template_dir)
+if HAS_ORJSON:
+    app.json = OrjsonProvider(app)
 CORS(app)
 
 # Configure Gemini API
 GEMINI_API_KEY = os.getenv('GEMINI_API_KEY', 'your-api-key-here')
-print(f"[DEBUG] HAS_GEMINI_SDK: {HAS_GEMINI_SDK}")
-print(f"[DEBUG] GEMINI_API_KEY set: {bool(GEMINI_API_KEY and GEMINI_API_KEY != 'your-api-key-here')}")
+log.debug("HAS_GEMINI_SDK: %s", HAS_GEMINI_SDK)
+log.debug("GEMINI_API_KEY set: %s", bool(GEMINI_API_KEY and GEMINI_API_KEY != 'your-api-key-here'))
+# Model is built once and shared by every request
+MODEL = None
 if HAS_GEMINI_SDK and GEMINI_API_KEY and GEMINI_API_KEY != 'your-api-key-here':
     try:
         genai.configure(api_key=GEMINI_API_KEY)
-        print(f"[DEBUG] Gemini API configured successfully")
+        # Use gemini-2.0-flash (latest model) or fall back to gemini-1.5-flash
+        try:
+            MODEL = genai.GenerativeModel('gemini-2.0-flash')
+        except Exception:
+            MODEL = genai.GenerativeModel('gemini-1.5-flash')
+        log.debug("Gemini API configured successfully")
     except Exception as e:
-        print(f"[DEBUG] Error configuring Gemini: {e}")
+        log.error("Error configuring Gemini: %s", e)
 
 # Writing tone options
 WRITING_TONES = {
@@ -52,180 +118,374 @@ WRITING_TONES = {
     'academic': 'Use an academic and scholarly tone'
 }
 
+# Read-only view of the tone instructions; requests resolve their tone once against it
+TONE_INSTRUCTION = types.MappingProxyType(WRITING_TONES)
+
+# Common misspellings: plain word swaps that need no regex of their own
+FIXED_WORDS = {
+    'recieve': 'receive',
+    'occured': 'occurred',
+    'seperate': 'separate',
+    'neccessary': 'necessary',
+    'definately': 'definitely',
+    'accross': 'across',
+    'wether': 'whether',
+}
+
+# Grammar rules: (pattern, replacement, reason)
+# Word-level rules whose replacements never refer back to the match
+_WORD_GRAMMAR_RULES = [
+    # Capitalization
+    (r'\bi\b', 'I', 'Capitalization: pronoun "i" → "I"'),
+    
+    # Common spelling mistakes, looked up in FIXED_WORDS
+    (r'\b(?:' + '|'.join(FIXED_WORDS) + r')\b', None, None),
+    
+    # Common phrase errors
+    (r"\bwould\s+of\b", 'would have', 'Grammar: "would of" → "would have"'),
+    (r"\bcould\s+of\b", 'could have', 'Grammar: "could of" → "could have"'),
+    (r"\bshould\s+of\b", 'should have', 'Grammar: "should of" → "should have"'),
+    (r"\blot\s+of\b", 'lot of', 'Grammar: correct usage of "lot of"'),
+    
+    # Double spaces
+    (r"  +", ' ', 'Spacing: remove extra spaces'),
+]
+
+# Context rules that rewrite around a captured word (\1); applied after the
+# word-level pass so e.g. "i has" is first capitalized, then agreed
+_CONTEXT_GRAMMAR_RULES = [
+    # Subject-verb agreement
+    (r'\b([Hh]e|[Ss]he|[Ii]t)\s+are\b', r'\1 is', 'Subject-verb agreement: "are" → "is"'),
+    (r'\b([Ii]|[Yy]ou|[Ww]e|[Tt]hey|people)\s+is\b', r'\1 are', 'Subject-verb agreement: "is" → "are"'),
+    (r'\b([Hh]e|[Ss]he|[Ii]t)\s+have\b', r'\1 has', 'Subject-verb agreement: "have" → "has"'),
+    (r'\b([Ii]|[Yy]ou|[Ww]e|[Tt]hey)\s+has\b', r'\1 have', 'Subject-verb agreement: "has" → "have"'),
+    
+    # Common contractions and typos
+    (r"\byour\s+(going|coming|doing|making|taking)\b", r"you're \1", 'Contraction: "your" → "you\'re"'),
+    (r"\bits\s+(?=[a-z])", "it's ", 'Contraction: "its" → "it\'s"'),
+    (r"\btheir\s+(going|coming|doing)\b", r"they're \1", 'Contraction: "their" → "they\'re"'),
+    (r"\bthere\s+(is|are)\b", r"there \1", 'Phrase: "there is/are" is correct'),
+]
+
+# Expansion template and reason for each fused rule, keyed by its group name
+RULES_BY_GROUP = {}
+
+def _fuse_grammar_rules(rules, first_index):
+    """
+    Compile a list of rules into one alternation with a named group per rule,
+    so a single scan of the text applies all of them
+    """
+    names = [f'r{first_index + i}' for i in range(len(rules))]
+    fused = re.compile(
+        '|'.join(f'(?P<{name}>{pattern})' for name, (pattern, _, _) in zip(names, rules)),
+        re.IGNORECASE
+    )
+    for name, (_, replacement, reason) in zip(names, rules):
+        if replacement is None:
+            RULES_BY_GROUP[name] = (None, reason)
+            continue
+        # Rule-local backreferences (\1) become absolute groups in the fused pattern
+        offset = fused.groupindex[name]
+        template = re.sub(r'\\(\d)', lambda m: f'\\g<{offset + int(m.group(1))}>', replacement)
+        RULES_BY_GROUP[name] = (template, reason)
+    return fused
+
+# Compile once at import so requests never pay for pattern parsing
+FUSED_GRAMMAR_PASSES = [
+    _fuse_grammar_rules(_WORD_GRAMMAR_RULES, 0),
+    _fuse_grammar_rules(_CONTEXT_GRAMMAR_RULES, len(_WORD_GRAMMAR_RULES)),
+]
+
+# Matches wherever any rule could fire; text it misses is returned as-is after one scan
+GRAMMAR_PREFILTER = re.compile(
+    '|'.join(f'(?:{pattern})' for pattern, _, _ in _WORD_GRAMMAR_RULES + _CONTEXT_GRAMMAR_RULES),
+    re.IGNORECASE
+)
+
+def _fixed_word(original):
+    """Fix for a matched misspelling, or None if it isn't in FIXED_WORDS"""
+    word = FIXED_WORDS.get(original.casefold())
+    if word is None:
+        # IGNORECASE also matches a few letters casefold() leaves alone (e.g. dotless ı)
+        word = next((fix for wrong, fix in FIXED_WORDS.items()
+                     if re.fullmatch(wrong, original, re.IGNORECASE)), None)
+    return word
+
+def _match_case(original, word):
+    """Carry the capitalization of a misspelt word over to its fix"""
+    if original.isupper():
+        return word.upper()
+    if original[0].isupper():
+        return word.capitalize()
+    return word
+
 def apply_local_grammar_correction(text, tone='original', show_explanations=True):
     """
     Apply comprehensive grammar corrections locally when Gemini API is unavailable
+    
+    Returns a fresh result dict on every call, so callers may modify it
     """
-    import re
+    corrected, improvements = _local_grammar_correction(text, bool(show_explanations))
+    return {
+        'correctedText': corrected,
+        'improvements': [
+            {'original': original, 'fixed': fixed, 'reason': reason}
+            for original, fixed, reason in improvements
+        ]
+    }
+
+@lru_cache(maxsize=4096)
+def _local_grammar_correction(text, show_explanations):
+    """
+    Memoized core of apply_local_grammar_correction. Returns immutable data,
+    (corrected_text, ((original, fixed, reason), ...)), since results are shared
+    """
+    if not GRAMMAR_PREFILTER.search(text):
+        return text.strip(), ()
     
-    corrections = []
-    corrected = text
+    # First correction recorded for each lowercased original, in insertion order
+    corrections = {}
     
-    # Grammar rules: (pattern, replacement, reason, is_regex)
-    grammar_rules = [
-        # Capitalization
-        (r'\bi\b', 'I', 'Capitalization: pronoun "i" → "I"', True),
-        
-        # Subject-verb agreement
-        (r'\b([Hh]e|[Ss]he|[Ii]t)\s+are\b', r'\1 is', 'Subject-verb agreement: "are" → "is"', True),
-        (r'\b([Ii]|[Yy]ou|[Ww]e|[Tt]hey|people)\s+is\b', r'\1 are', 'Subject-verb agreement: "is" → "are"', True),
-        (r'\b([Hh]e|[Ss]he|[Ii]t)\s+have\b', r'\1 has', 'Subject-verb agreement: "have" → "has"', True),
-        (r'\b([Ii]|[Yy]ou|[Ww]e|[Tt]hey)\s+has\b', r'\1 have', 'Subject-verb agreement: "has" → "have"', True),
-        
-        # Common contractions and typos
-        (r"\byour\s+(going|coming|doing|making|taking)\b", r"you're \1", 'Contraction: "your" → "you\'re"', True),
-        (r"\bits\s+([a-z])", r"it's \1", 'Contraction: "its" → "it\'s"', True),
-        (r"\btheir\s+(going|coming|doing)\b", r"they're \1", 'Contraction: "their" → "they\'re"', True),
-        (r"\bthere\s+(is|are)\b", r"there \1", 'Phrase: "there is/are" is correct', True),
-        
-        # Common spelling mistakes
-        (r"\brecieve\b", 'receive', 'Spelling: "recieve" → "receive"', True),
-        (r"\boccured\b", 'occurred', 'Spelling: "occured" → "occurred"', True),
-        (r"\bseperate\b", 'separate', 'Spelling: "seperate" → "separate"', True),
-        (r"\bneccessary\b", 'necessary', 'Spelling: "neccessary" → "necessary"', True),
-        (r"\bdefinately\b", 'definitely', 'Spelling: "definately" → "definitely"', True),
-        (r"\baccross\b", 'across', 'Spelling: "accross" → "across"', True),
-        (r"\bwether\b", 'whether', 'Spelling: "wether" → "whether"', True),
-        
-        # Common phrase errors
-        (r"\bwould\s+of\b", 'would have', 'Grammar: "would of" → "would have"', True),
-        (r"\bcould\s+of\b", 'could have', 'Grammar: "could of" → "could have"', True),
-        (r"\bshould\s+of\b", 'should have', 'Grammar: "should of" → "should have"', True),
-        (r"\blot\s+of\b", 'lot of', 'Grammar: correct usage of "lot of"', True),
-        
-        # Double spaces
-        (r"  +", ' ', 'Spacing: remove extra spaces', True),
-    ]
+    def _repl(match):
+        template, reason = RULES_BY_GROUP[match.lastgroup]
+        original = match.group(0)
+        key = original.lower()
+        if template is None:
+            word = _fixed_word(original)
+            if word is None:
+                return original
+            fixed = _match_case(original, word)
+            reason = f'Spelling: "{key}" → "{word}"'
+        else:
+            fixed = match.expand(template)
+        # Avoid duplicate improvements
+        if show_explanations and original != fixed:
+            corrections.setdefault(key, (original, fixed, reason))
+        return fixed
     
-    # Apply each rule
-    for pattern, replacement, reason, is_regex in grammar_rules:
-        try:
-            if is_regex:
-                # Find matches first to record them
-                matches = list(re.finditer(pattern, corrected, flags=re.IGNORECASE))
-                for match in matches:
-                    original = match.group(0)
-                    fixed = re.sub(pattern, replacement, original, flags=re.IGNORECASE)
-                    if original != fixed and show_explanations:
-                        # Avoid duplicate improvements
-                        exists = any(c['original'].lower() == original.lower() for c in corrections)
-                        if not exists:
-                            corrections.append({
-                                'original': original,
-                                'fixed': fixed,
-                                'reason': reason
-                            })
-                
-                # Apply substitution to entire text
-                corrected = re.sub(pattern, replacement, corrected, flags=re.IGNORECASE)
-            else:
-                # Simple string replacement
-                if pattern in corrected:
-                    if show_explanations:
-                        corrections.append({
-                            'original': pattern,
-                            'fixed': replacement,
-                            'reason': reason
-                        })
-                    corrected = corrected.replace(pattern, replacement)
-        except Exception as e:
-            print(f"[DEBUG] Grammar rule error for pattern {pattern}: {e}")
-            continue
+    corrected = text
+    for fused in FUSED_GRAMMAR_PASSES:
+        corrected = fused.sub(_repl, corrected)
     
-    return json.dumps({
-        'correctedText': corrected.strip(),
-        'improvements': corrections[:10]  # Limit to 10 improvements to avoid clutter
-    })
+    # Limit to 10 improvements to avoid clutter
+    return corrected.strip(), tuple(corrections.values())[:10]
 
-def enhance_text(text, tone='original', show_explanations=True):
-    """
-    Enhance text using Gemini API with specified tone
-    """
-    try:
-        tone_instruction = WRITING_TONES.get(tone, WRITING_TONES['original'])
+# Bounded cache of enhance_text results. Keys hold a digest of the text rather than
+# the text itself so large submissions don't pin memory.
+ENHANCE_CACHE_SIZE = 500
+_enhance_cache = OrderedDict()
+_enhance_cache_lock = threading.Lock()
+_enhance_cache_stats = {'hits': 0, 'misses': 0}
 
-        prompt = f"""You are an expert grammar correction and writing enhancement assistant.
+def _enhance_cache_key(text, tone_instruction, show_explanations):
+    return (hashlib.blake2b(text.encode('utf-8')).digest(), tone_instruction, bool(show_explanations))
+
+# Entries are deep-copied on the way in and out so no caller shares a mutable result
+def _enhance_cache_get(key):
+    with _enhance_cache_lock:
+        result = _enhance_cache.get(key)
+        if result is None:
+            _enhance_cache_stats['misses'] += 1
+            return None
+        _enhance_cache_stats['hits'] += 1
+        _enhance_cache.move_to_end(key)
+    return copy.deepcopy(result)
+
+def _enhance_cache_put(key, result):
+    result = copy.deepcopy(result)
+    with _enhance_cache_lock:
+        _enhance_cache[key] = result
+        _enhance_cache.move_to_end(key)
+        if len(_enhance_cache) > ENHANCE_CACHE_SIZE:
+            _enhance_cache.popitem(last=False)
+
+# Constant parts of the Gemini prompt, so each call only joins in the tone and text
+_PROMPT_HEAD = """You are an expert grammar correction and writing enhancement assistant.
 
 Task: Review and improve the following text.
-Tone: {tone_instruction}
+Tone: """
+_PROMPT_MID = """
 
 Original Text:
-{text}
+"""
+_PROMPT_TAIL = """
 
 Please provide:
 1. The corrected and enhanced version of the text
-2. {"A list of specific improvements made (in JSON format with 'original', 'fixed', and 'reason' fields)" if show_explanations else ""}
+2. %s
 
 Format your response as JSON with these fields:
 - correctedText: The improved text
-- improvements: [{{"original": "...", "fixed": "...", "reason": "..."}}] (only if explanations are requested)
+- improvements: [{"original": "...", "fixed": "...", "reason": "..."}] (only if explanations are requested)
 
 Respond ONLY with valid JSON, no additional text."""
+_PROMPT_TAIL_EXPL = _PROMPT_TAIL % "A list of specific improvements made (in JSON format with 'original', 'fixed', and 'reason' fields)"
+_PROMPT_TAIL_NOEXPL = _PROMPT_TAIL % ""
+
+def _build_prompt(text, tone_instruction, show_explanations):
+    """Build the Gemini prompt for a text and tone"""
+    return f"{_PROMPT_HEAD}{tone_instruction}{_PROMPT_MID}{text}{_PROMPT_TAIL_EXPL if show_explanations else _PROMPT_TAIL_NOEXPL}"
+
+def _gemini_enabled():
+    # MODEL stays None if configuring Gemini failed at import
+    return MODEL is not None
 
-        if HAS_GEMINI_SDK and GEMINI_API_KEY and GEMINI_API_KEY != 'your-api-key-here':
+# Markdown code fence Gemini sometimes wraps its JSON in
+FENCE_RE = re.compile(r'^\s*```(?:json)?(.*?)(?:```)?\s*$', re.DOTALL)
+
+def _parse_result_json(result_text):
+    """Parse a JSON result, stripping any markdown code fence Gemini wrapped it in"""
+    match = FENCE_RE.match(result_text)
+    return _json_loads(match.group(1) if match else result_text)
+
+def _local_enhance(text, show_explanations):
+    """Enhancement result from the local grammar rules alone (they ignore tone)"""
+    result = apply_local_grammar_correction(text, show_explanations=show_explanations)
+    return {
+        'correctedText': result.get('correctedText', text),
+        'improvements': result.get('improvements', []) if show_explanations else []
+    }
+
+async def enhance_text(text, tone_instruction=TONE_INSTRUCTION['original'], show_explanations=True):
+    """
+    Enhance text using Gemini API with the given tone instruction (a TONE_INSTRUCTION value)
+    
+    Gemini and the local fallback run in worker threads. The SDK's async client binds
+    to the first event loop it runs on, and Flask gives each async view a fresh loop,
+    so the blocking client is used instead of generate_content_async.
+    """
+    cache_key = _enhance_cache_key(text, tone_instruction, show_explanations)
+    cached = _enhance_cache_get(cache_key)
+    if cached is not None:
+        return cached
+    
+    # Local fallbacks after a Gemini failure are not cached, so a retry can reach Gemini
+    cacheable = True
+    try:
+        if _gemini_enabled():
+            # The prompt is only needed when Gemini will actually be called
+            prompt = _build_prompt(text, tone_instruction, show_explanations)
             try:
-                # Use gemini-2.0-flash (latest model) or fall back to gemini-1.5-flash
-                try:
-                    model = genai.GenerativeModel('gemini-2.0-flash')
-                except:
-                    model = genai.GenerativeModel('gemini-1.5-flash')
-                
-                response = model.generate_content(prompt)
+                response = await asyncio.to_thread(MODEL.generate_content, prompt)
                 result_text = response.text.strip()
-                print(f"[DEBUG] Gemini response received: {result_text[:100]}...")
+                log.debug("Gemini response received: %.100s...", result_text)
             except Exception as e:
-                print(f"[DEBUG] Gemini API error: {e}")
+                log.warning("Gemini API error, using local correction: %s", e)
+                cacheable = False
                 # Use local grammar correction with simple rules
-                result_text = apply_local_grammar_correction(text, tone, show_explanations)
+                result_text = await asyncio.to_thread(apply_local_grammar_correction, text, show_explanations=show_explanations)
         else:
-            print(f"[DEBUG] Gemini SDK not available or API key not set")
+            log.debug("Gemini SDK not available or API key not set")
             # Local fallback using simple grammar rules
-            result_text = apply_local_grammar_correction(text, tone, show_explanations)
+            result_text = await asyncio.to_thread(apply_local_grammar_correction, text, show_explanations=show_explanations)
         
-        # Clean up JSON response if it came from Gemini
+        # Clean up JSON response if it came from Gemini; the local fallback is already a dict
         if isinstance(result_text, str):
-            if result_text.startswith('```json'):
-                result_text = result_text[7:]
-            if result_text.startswith('```'):
-                result_text = result_text[3:]
-            if result_text.endswith('```'):
-                result_text = result_text[:-3]
-            
-            result = json.loads(result_text.strip())
+            result = _parse_result_json(result_text)
         else:
             result = result_text
         
-        return {
+        enhanced = {
             'correctedText': result.get('correctedText', text),
             'improvements': result.get('improvements', []) if show_explanations else []
         }
+        if cacheable:
+            _enhance_cache_put(cache_key, enhanced)
+        return enhanced
     
     except Exception as e:
-        print(f"Error in enhance_text: {e}")
+        log.exception("Error in enhance_text: %s", e)
         return {
             'correctedText': text,
             'improvements': [],
             'error': str(e)
         }
 
+# Start of the correctedText string in a partially received Gemini reply, up to the
+# last complete character (a trailing lone backslash is left for the next chunk)
+_PARTIAL_CORRECTED_TEXT_RE = re.compile(r'"correctedText"\s*:\s*"((?:[^"\\]|\\.)*)')
+
+def _partial_corrected_text(buffer):
+    """Decode as much of the correctedText value as has arrived so far"""
+    match = _PARTIAL_CORRECTED_TEXT_RE.search(buffer)
+    if match is None:
+        return ''
+    raw = match.group(1)
+    try:
+        return json.loads(f'"{raw}"', strict=False)
+    except ValueError:
+        # A \uXXXX escape was cut off mid-chunk; decode up to it
+        cut = raw.rfind('\\')
+        if cut < 0:
+            return ''
+        return json.loads(f'"{raw[:cut]}"', strict=False)
+
+def _sse_event(payload):
+    return f"data: {_json_dumps(payload)}\n\n"
+
+def stream_enhance_text(text, tone_instruction=TONE_INSTRUCTION['original'], show_explanations=True):
+    """
+    Enhance text like enhance_text, yielding Server-Sent Events as Gemini replies:
+    {"delta": ...} for each new piece of the corrected text, then a final
+    {"done": true, "correctedText": ..., "improvements": [...]}, or {"error": ...}
+    if even the local fallback fails
+    """
+    cache_key = _enhance_cache_key(text, tone_instruction, show_explanations)
+    enhanced = None
+    if _gemini_enabled():
+        enhanced = _enhance_cache_get(cache_key)
+        if enhanced is None:
+            try:
+                prompt = _build_prompt(text, tone_instruction, show_explanations)
+                
+                result_text = ''
+                sent = 0
+                for chunk in MODEL.generate_content(prompt, stream=True):
+                    result_text += chunk.text
+                    partial = _partial_corrected_text(result_text)
+                    if len(partial) > sent:
+                        yield _sse_event({'delta': partial[sent:]})
+                        sent = len(partial)
+                
+                result = _parse_result_json(result_text.strip())
+                enhanced = {
+                    'correctedText': result.get('correctedText', text),
+                    'improvements': result.get('improvements', []) if show_explanations else []
+                }
+                _enhance_cache_put(cache_key, enhanced)
+            except Exception as e:
+                log.warning("Gemini streaming error, using local correction: %s", e)
+                # The final event replaces whatever deltas were already sent
+                enhanced = None
+    
+    # Headers are already sent, so failures must be reported as an event
+    try:
+        if enhanced is None:
+            enhanced = _local_enhance(text, show_explanations)
+        event = _sse_event({'done': True, **enhanced})
+    except Exception as e:
+        log.exception("Error in stream_enhance_text: %s", e)
+        event = _sse_event({'error': str(e)})
+    yield event
+
 @app.route('/')
 def index():
     """Serve the main application page"""
     return render_template('index.html')
 
 @app.route('/api/enhance', methods=['POST'])
-def api_enhance():
+async def api_enhance():
     """API endpoint for text enhancement"""
     try:
         data = request.json
         text = data.get('text', '')
-        tone = data.get('tone', 'original')
-        show_explanations = data.get('showExplanations', True)
+        tone_instruction = TONE_INSTRUCTION.get(data.get('tone', 'original'), TONE_INSTRUCTION['original'])
+        show_explanations = bool(data.get('showExplanations', True))
         
         if not text or not text.strip():
             return jsonify({'error': 'Text is required'}), 400
         
-        result = enhance_text(text, tone, show_explanations)
+        result = await enhance_text(text, tone_instruction, show_explanations)
         
         if 'error' in result:
             return jsonify({'error': result['error']}), 500
@@ -235,6 +495,57 @@ def api_enhance():
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/enhance/stream', methods=['POST'])
+def api_enhance_stream():
+    """API endpoint for text enhancement, streamed as Server-Sent Events"""
+    try:
+        data = request.json
+        text = data.get('text', '')
+        tone_instruction = TONE_INSTRUCTION.get(data.get('tone', 'original'), TONE_INSTRUCTION['original'])
+        show_explanations = bool(data.get('showExplanations', True))
+        
+        if not text or not text.strip():
+            return jsonify({'error': 'Text is required'}), 400
+        
+        return Response(
+            stream_with_context(stream_enhance_text(text, tone_instruction, show_explanations)),
+            mimetype='text/event-stream',
+            headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+        )
+    
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/cache_stats', methods=['GET'])
+def cache_stats():
+    """Hit-rate counters for the enhancement and local correction caches"""
+    with _enhance_cache_lock:
+        enhance_hits = _enhance_cache_stats['hits']
+        enhance_misses = _enhance_cache_stats['misses']
+        enhance_size = len(_enhance_cache)
+    local_info = _local_grammar_correction.cache_info()
+    
+    def hit_rate(hits, misses):
+        total = hits + misses
+        return hits / total if total else 0.0
+    
+    return jsonify({
+        'enhance': {
+            'hits': enhance_hits,
+            'misses': enhance_misses,
+            'size': enhance_size,
+            'maxsize': ENHANCE_CACHE_SIZE,
+            'hitRate': hit_rate(enhance_hits, enhance_misses)
+        },
+        'localCorrection': {
+            'hits': local_info.hits,
+            'misses': local_info.misses,
+            'size': local_info.currsize,
+            'maxsize': local_info.maxsize,
+            'hitRate': hit_rate(local_info.hits, local_info.misses)
+        }
+    })
+
 @app.route('/api/health', methods=['GET'])
 def health_check():
     """Health check endpoint"""
@@ -250,6 +561,9 @@ if __name__ == '__main__':
         print("\n⚠️  WARNING: GEMINI_API_KEY not configured!")
         print("Set it using: export GEMINI_API_KEY='your-actual-api-key'\n")
     
+    # Development server only; deploy with gunicorn (see wsgi.py)
+    debug = os.getenv('FLASK_DEBUG', '').lower() in ('1', 'true', 'yes')
+    
     print("🚀 SkyWrite AI Backend starting...")
     print("📝 Access the app at: http://localhost:5000")
-    app.run(debug=True, host='0.0.0.0', port=5000)
+    app.run(debug=debug, host='0.0.0.0', port=5000)
@@ -0,0 +1,15 @@
+"""
+SkyWrite AI - WSGI entry point
+
+Production server with threaded workers, so requests waiting on Gemini run side by
+side (workers x threads at a time):
+
+    gunicorn -k gthread -w 4 --threads 8 --bind 0.0.0.0:5000 wsgi:app
+
+gthread rather than gevent: the Gemini SDK talks gRPC, whose C core blocks the
+gevent hub, and /api/enhance is an async view that runs its own event loop.
+
+Requires: pip install gunicorn
+"""
+
+from app import app